@@ -0,0 +1,745 @@
+"""Concurrent-session load test for the marketing dashboard.
+
+Drives the five dashboard pages with N simultaneous sessions, each one
+moving the page, date range and platform filters at random, and reports
+rerun latency (p50/p95/p99), throughput and per-process memory for every
+concurrency level. Two saved runs can be compared against each other.
+
+Usage:
+    python loadtest.py run --concurrency 1,2,4,8 --reruns 25 --output base.json
+    python loadtest.py run --concurrency 1,2,4,8 --reruns 25 --output new.json
+    python loadtest.py compare base.json new.json
+
+Backends:
+    standin  Executes app.py against a local stand-in for the streamlit
+             module: widgets return the session's filter state, cached data
+             is unpickled per call as st.cache_data does, charts and tables
+             are serialized to JSON and everything else is a no-op. Sessions
+             share one worker process (one thread each, like a Streamlit
+             server), so the memory figure is that worker's RSS.
+    apptest  Streamlit's headless app-testing API (streamlit.testing.v1),
+             as a fidelity check on the stand-in. AppTest swaps
+             process-global runtime state on every run, so each session gets
+             its own process: N sessions are N processes on separate cores,
+             not one worker sharing the GIL. Memory is reported per session
+             process and summed across them.
+    auto     standin, the backend that models a shared worker.
+"""
+
+import argparse
+import builtins
+import csv
+import datetime as dt
+import json
+import multiprocessing
+import os
+import pickle
+import platform as platform_info
+import queue
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+APP_PATH = APP_DIR / "app.py"
+MARKETING_CSV = APP_DIR / "data" / "marketing_data_processed.csv"
+
+# Must match the "Navigate to:" options in app.py
+PAGES = [
+    "📊 Executive Dashboard",
+    "🚀 Platform Performance",
+    "🎯 Campaign Analysis",
+    "💼 Business Impact",
+    "🔄 Attribution Analysis",
+]
+
+# Metrics compared between runs; True means a higher value is worse
+COMPARED_METRICS = {
+    "p50_ms": True,
+    "p95_ms": True,
+    "p99_ms": True,
+    "throughput_rps": False,
+    "rss_peak_mb": True,
+    "rss_total_peak_mb": True,
+}
+
+
+# ---------------------------------------------------------------------------
+# Filter state
+# ---------------------------------------------------------------------------
+
+def read_filter_bounds():
+    """Date bounds and platform options, as the app's sidebar computes them."""
+    dates = []
+    platforms = []
+    with open(MARKETING_CSV, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            dates.append(row["date"])
+            if row["platform"] not in platforms:
+                platforms.append(row["platform"])
+    return {
+        "min_date": dt.date.fromisoformat(min(dates)[:10]),
+        "max_date": dt.date.fromisoformat(max(dates)[:10]),
+        "platforms": platforms,
+    }
+
+
+def initial_state(bounds):
+    # The app's defaults on first load
+    return {
+        "page": PAGES[0],
+        "date_range": (bounds["min_date"], bounds["max_date"]),
+        "platforms": ["All"],
+    }
+
+
+def random_change(rng, state, bounds):
+    """Change one sidebar control at random, the way a user triggers a rerun."""
+    control = rng.choice(("page", "date_range", "platforms"))
+
+    if control == "page":
+        state["page"] = rng.choice(PAGES)
+    elif control == "date_range":
+        span = (bounds["max_date"] - bounds["min_date"]).days
+        start = rng.randint(0, span)
+        end = rng.randint(start, span)
+        state["date_range"] = (
+            bounds["min_date"] + dt.timedelta(days=start),
+            bounds["min_date"] + dt.timedelta(days=end),
+        )
+    else:
+        if rng.random() < 0.25:
+            state["platforms"] = ["All"]
+        else:
+            count = rng.randint(1, len(bounds["platforms"]))
+            state["platforms"] = rng.sample(bounds["platforms"], count)
+
+    return control
+
+
+# ---------------------------------------------------------------------------
+# Sessions
+# ---------------------------------------------------------------------------
+
+class AppTestSession:
+    """One browser session driven through streamlit.testing.v1.AppTest."""
+
+    def __init__(self, script, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self._at = AppTest.from_file(str(script), default_timeout=timeout)
+        self._applied = None
+
+    def run(self, state):
+        at = self._at
+        applied = self._applied
+
+        # Widgets only exist after the first run; afterwards set what changed
+        if applied is not None:
+            if state["page"] != applied["page"]:
+                at.sidebar.selectbox[0].set_value(state["page"])
+            if state["date_range"] != applied["date_range"]:
+                at.sidebar.date_input[0].set_value(state["date_range"])
+            if state["platforms"] != applied["platforms"]:
+                at.sidebar.multiselect[0].set_value(state["platforms"])
+
+        at.run()
+        self._applied = dict(state)
+
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+
+class _Noop:
+    """Stands in for any element or container the load test doesn't inspect."""
+
+    def __call__(self, *args, **kwargs):
+        return None
+
+    def __getattr__(self, name):
+        # Element calls on a container, e.g. col.metric(...)
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP = _Noop()
+
+# st.cache_data stand-in, shared by every session in the process. Like the
+# real one it stores pickled values and hands each caller a fresh copy.
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _cache_data(func):
+    def wrapper(*args, **kwargs):
+        key = (func.__code__.co_filename, func.__qualname__, args, tuple(sorted(kwargs.items())))
+        with _cache_lock:
+            if key not in _cache:
+                _cache[key] = pickle.dumps(func(*args, **kwargs))
+            pickled = _cache[key]
+        return pickle.loads(pickled)
+    return wrapper
+
+
+class _StandInSidebar:
+    def __init__(self, state):
+        self._state = state
+
+    def selectbox(self, label, options, *args, **kwargs):
+        return self._state["page"]
+
+    def date_input(self, label, *args, **kwargs):
+        return self._state["date_range"]
+
+    def multiselect(self, label, options, *args, **kwargs):
+        return list(self._state["platforms"])
+
+    def __getattr__(self, name):
+        return _NOOP
+
+
+class _StandInStreamlit:
+    def __init__(self, state):
+        self.sidebar = _StandInSidebar(state)
+
+    cache_data = staticmethod(_cache_data)
+
+    def columns(self, spec, *args, **kwargs):
+        count = spec if isinstance(spec, int) else len(spec)
+        return [_NOOP] * count
+
+    def tabs(self, labels):
+        return [_NOOP] * len(labels)
+
+    def plotly_chart(self, fig, *args, **kwargs):
+        # Streamlit ships every figure to the browser as JSON
+        fig.to_json()
+
+    def dataframe(self, data, *args, **kwargs):
+        # Streamlit sends tables as Arrow; JSON is a comparable serialization cost
+        data.to_json()
+
+    def __getattr__(self, name):
+        return _NOOP
+
+
+_compiled = {}
+
+
+class StandInSession:
+    """One session that reruns a script in-process against the stand-in module."""
+
+    def __init__(self, script, timeout):
+        self._script = str(script)
+        if self._script not in _compiled:
+            source = Path(self._script).read_text(encoding="utf-8")
+            _compiled[self._script] = compile(source, self._script, "exec")
+
+    def run(self, state):
+        """Rerun the script with the given filter state; returns its globals."""
+        st = _StandInStreamlit(dict(state))
+
+        def _import(name, globals=None, locals=None, fromlist=(), level=0):
+            if name == "streamlit":
+                return st
+            return builtins.__import__(name, globals, locals, fromlist, level)
+
+        script_globals = {
+            "__name__": "__main__",
+            "__file__": self._script,
+            "__builtins__": {**vars(builtins), "__import__": _import},
+        }
+        exec(_compiled[self._script], script_globals)
+        return script_globals
+
+
+BACKENDS = {
+    "apptest": AppTestSession,
+    "standin": StandInSession,
+}
+
+
+def resolve_backend(name):
+    # Only the stand-in runs every session in one worker process
+    return "standin" if name == "auto" else name
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def current_rss_bytes():
+    """Resident set size of this process, or its peak where that's all we get."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    """Tracks peak RSS of the current process on a background thread."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.baseline = current_rss_bytes()
+        self.peak = self.baseline
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self._record()
+            self._stop.wait(self.interval)
+
+    def _record(self):
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._record()
+        return False
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def _mb(value):
+    return None if value is None else value / (1024 * 1024)
+
+
+# ---------------------------------------------------------------------------
+# Running a concurrency level
+# ---------------------------------------------------------------------------
+
+def drive_user(user_id, config, bounds, barrier):
+    """Open one session, wait for the others, then perform the reruns."""
+    rng = random.Random(f"{config['seed']}-{config['concurrency']}-{user_id}")
+    state = initial_state(bounds)
+    result = {"latencies_ms": [], "startup_ms": None, "errors": 0, "messages": []}
+    session = None
+
+    try:
+        session = BACKENDS[config["backend"]](config["script"], config["timeout"])
+        started = time.perf_counter()
+        session.run(state)
+        result["startup_ms"] = (time.perf_counter() - started) * 1000
+    except Exception as exc:
+        session = None
+        result["errors"] += 1
+        result["messages"].append(f"startup: {exc!r}")
+    finally:
+        barrier.wait()
+
+    if session is None:
+        return result
+
+    for _ in range(config["reruns"]):
+        control = random_change(rng, state, bounds)
+        started = time.perf_counter()
+        try:
+            session.run(state)
+        except Exception as exc:
+            result["errors"] += 1
+            result["messages"].append(f"{control}: {exc!r}")
+            continue
+        result["latencies_ms"].append((time.perf_counter() - started) * 1000)
+
+        if config["think_ms"]:
+            time.sleep(config["think_ms"] / 1000)
+
+    return result
+
+
+def summarize(config, user_results, wall_s, rss_baseline, rss_peaks, processes):
+    latencies = sorted(ms for r in user_results for ms in r["latencies_ms"])
+    startups = [r["startup_ms"] for r in user_results if r["startup_ms"] is not None]
+    messages = [m for r in user_results for m in r["messages"]]
+    peaks = [p for p in rss_peaks if p is not None]
+    rss_peak = _mb(max(peaks)) if peaks else None
+
+    return {
+        "concurrency": config["concurrency"],
+        "processes": processes,
+        "reruns": len(latencies),
+        "errors": sum(r["errors"] for r in user_results),
+        "error_samples": messages[:5],
+        "wall_s": wall_s,
+        "throughput_rps": len(latencies) / wall_s if wall_s > 0 else None,
+        "mean_ms": sum(latencies) / len(latencies) if latencies else None,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": latencies[-1] if latencies else None,
+        "startup_max_ms": max(startups) if startups else None,
+        "rss_baseline_mb": _mb(rss_baseline),
+        "rss_peak_mb": rss_peak,
+        "rss_total_peak_mb": _mb(sum(peaks)) if peaks else None,
+    }
+
+
+def add_rss_per_session(levels):
+    """Memory each extra session adds to a shared worker: (peak(N) - peak(1)) / (N - 1).
+
+    Comparing against the one-session level cancels out imports and loaded
+    data, which every level pays once. Left as None where there is no
+    single-process one-session level to compare with.
+    """
+    single = next((level for level in levels
+                   if level["concurrency"] == 1 and level["processes"] == 1), None)
+    for level in levels:
+        level["rss_per_session_mb"] = None
+        if (single is None or level["concurrency"] < 2 or level["processes"] != 1
+                or level["rss_peak_mb"] is None or single["rss_peak_mb"] is None):
+            continue
+        level["rss_per_session_mb"] = (
+            (level["rss_peak_mb"] - single["rss_peak_mb"]) / (level["concurrency"] - 1))
+
+
+def run_threaded_level(config, bounds):
+    """All sessions share this process, one thread each, like a Streamlit worker."""
+    concurrency = config["concurrency"]
+    barrier = threading.Barrier(concurrency + 1)
+    results = [None] * concurrency
+
+    def target(user_id):
+        results[user_id] = drive_user(user_id, config, bounds, barrier)
+
+    with RssSampler() as sampler:
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        wall_s = time.perf_counter() - started
+
+    return summarize(config, results, wall_s, sampler.baseline, [sampler.peak], processes=1)
+
+
+def _user_process(user_id, config, bounds, barrier, results):
+    sampler = None
+    try:
+        with RssSampler() as sampler:
+            result = drive_user(user_id, config, bounds, barrier)
+    except Exception as exc:
+        result = {"latencies_ms": [], "startup_ms": None, "errors": 1, "messages": [repr(exc)]}
+    result["rss_baseline"] = sampler.baseline if sampler else None
+    result["rss_peak"] = sampler.peak if sampler else None
+    results.put(result)
+
+
+def run_process_level(config, bounds):
+    """One process per session, for backends that can't share a process."""
+    concurrency = config["concurrency"]
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(concurrency + 1)
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(target=_user_process, args=(i, config, bounds, barrier, results))
+        for i in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        # Startup includes interpreter spawn and first script run
+        barrier.wait(timeout=config["timeout"] * 4)
+    except threading.BrokenBarrierError:
+        pass
+    started = time.perf_counter()
+    collected = []
+    deadline = (time.monotonic() + config["timeout"] * (config["reruns"] + 1)
+                + config["reruns"] * config["think_ms"] / 1000)
+    while len(collected) < concurrency:
+        try:
+            collected.append(results.get(timeout=max(deadline - time.monotonic(), 0.1)))
+        except queue.Empty:
+            break
+    wall_s = time.perf_counter() - started
+
+    for worker in workers:
+        worker.join(timeout=5)
+        if worker.is_alive():
+            worker.terminate()
+
+    missing = concurrency - len(collected)
+    collected += [
+        {"latencies_ms": [], "startup_ms": None, "errors": 1,
+         "messages": ["session process did not report"], "rss_baseline": None, "rss_peak": None}
+        for _ in range(missing)
+    ]
+    baselines = [r["rss_baseline"] for r in collected if r["rss_baseline"] is not None]
+    return summarize(
+        config, collected, wall_s,
+        max(baselines) if baselines else None,
+        [r["rss_peak"] for r in collected],
+        processes=concurrency,
+    )
+
+
+def run_level(config, bounds):
+    if config["backend"] == "apptest":
+        return run_process_level(config, bounds)
+    if not config["isolate"]:
+        return run_threaded_level(config, bounds)
+    # A fresh worker per level keeps one level's memory out of the next
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(run_threaded_level, config, bounds).result()
+
+
+def error_rate(level):
+    """Fraction of rerun attempts that failed; 0.0 when nothing was attempted."""
+    attempts = level["reruns"] + level["errors"]
+    return level["errors"] / attempts if attempts else 0.0
+
+
+def check_slos(level, args):
+    breaches = []
+    for key, limit in (("p95_ms", args.slo_p95_ms), ("p99_ms", args.slo_p99_ms),
+                       ("rss_peak_mb", args.slo_rss_mb)):
+        if limit is not None and level[key] is not None and level[key] > limit:
+            breaches.append(f"{key} {level[key]:.1f} > {limit:g}")
+    if args.max_error_rate is not None:
+        rate = error_rate(level)
+        if rate > args.max_error_rate:
+            breaches.append(f"error rate {rate:.1%} > {args.max_error_rate:.1%}")
+    return breaches
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def _fmt(value, spec=".1f"):
+    return "-" if value is None else format(value, spec)
+
+
+def _multi_process(*reports):
+    return any(level.get("processes", 1) > 1 for report in reports for level in report["levels"])
+
+
+def print_report(report):
+    meta = report["meta"]
+    multi_process = _multi_process(report)
+    print(f"backend={meta['backend']} reruns/session={meta['reruns']} "
+          f"think={meta['think_ms']}ms seed={meta['seed']}")
+    if multi_process:
+        print("note: N sessions ran as N processes, not one worker; "
+              "peak RSS is per session process, total RSS is their sum")
+
+    total_header = f" {'total RSS MB':>13}" if multi_process else ""
+    print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'rerun/s':>8} {'peak RSS MB':>12}{total_header}  SLO")
+    for level in report["levels"]:
+        slo = "ok" if not level["slo_breaches"] else "; ".join(level["slo_breaches"])
+        total = f" {_fmt(level['rss_total_peak_mb']):>13}" if multi_process else ""
+        print(f"{level['concurrency']:>8} {level['reruns']:>7} {level['errors']:>6} "
+              f"{_fmt(level['p50_ms']):>9} {_fmt(level['p95_ms']):>9} {_fmt(level['p99_ms']):>9} "
+              f"{_fmt(level['throughput_rps']):>8} {_fmt(level['rss_peak_mb']):>12}{total}  {slo}")
+        for message in level["error_samples"]:
+            print(f"{'':>8} ! {message}")
+
+
+def compare_reports(base, new, threshold):
+    """Rows of (concurrency, metric, base, new, change %, regressed), plus the
+    base concurrency levels the new run doesn't have."""
+    new_levels = {level["concurrency"]: level for level in new["levels"]}
+    metrics = dict(COMPARED_METRICS)
+    # With one process per level the total is the same number as the peak
+    if not _multi_process(base, new):
+        del metrics["rss_total_peak_mb"]
+
+    rows = []
+    missing = []
+    for base_level in base["levels"]:
+        new_level = new_levels.get(base_level["concurrency"])
+        if new_level is None:
+            missing.append(base_level["concurrency"])
+            continue
+        for metric, higher_is_worse in metrics.items():
+            before, after = base_level.get(metric), new_level.get(metric)
+            if before is None or after is None:
+                rows.append((base_level["concurrency"], metric, before, after, None, False))
+                continue
+            # No meaningful percentage from a zero baseline
+            change = (after - before) / before * 100 if before else None
+            regressed = False
+            if change is not None:
+                regressed = (change if higher_is_worse else -change) > threshold
+            rows.append((base_level["concurrency"], metric, before, after, change, regressed))
+
+        # Failed reruns don't show up in latency, so any increase counts
+        before, after = error_rate(base_level) * 100, error_rate(new_level) * 100
+        change = (after - before) / before * 100 if before else None
+        rows.append((base_level["concurrency"], "error_pct", before, after, change, after > before))
+    return rows, missing
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+def cmd_run(args):
+    backend = resolve_backend(args.backend)
+    bounds = read_filter_bounds()
+    report = {
+        "meta": {
+            "label": args.label,
+            "backend": backend,
+            "reruns": args.reruns,
+            "think_ms": args.think_ms,
+            "seed": args.seed,
+            "python": platform_info.python_version(),
+            "platform": platform_info.platform(),
+            "cpu_count": os.cpu_count(),
+            "created": dt.datetime.now().isoformat(timespec="seconds"),
+        },
+        "levels": [],
+    }
+
+    for concurrency in args.concurrency:
+        config = {
+            "backend": backend,
+            "concurrency": concurrency,
+            "reruns": args.reruns,
+            "think_ms": args.think_ms,
+            "seed": args.seed,
+            "timeout": args.timeout,
+            "isolate": not args.no_isolate,
+            "script": str(APP_PATH),
+        }
+        print(f"running {concurrency} concurrent session(s)...", file=sys.stderr)
+        level = run_level(config, bounds)
+        level["slo_breaches"] = check_slos(level, args)
+        report["levels"].append(level)
+
+    add_rss_per_session(report["levels"])
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"results written to {args.output}", file=sys.stderr)
+
+    return 1 if any(level["slo_breaches"] for level in report["levels"]) else 0
+
+
+def cmd_compare(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, encoding="utf-8") as f:
+        new = json.load(f)
+
+    for key in ("backend", "reruns", "think_ms", "seed"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"warning: runs differ in {key} "
+                  f"({base['meta'].get(key)} vs {new['meta'].get(key)})", file=sys.stderr)
+
+    rows, missing = compare_reports(base, new, args.threshold)
+    for concurrency in missing:
+        print(f"missing: {concurrency} session(s) is in {args.base} but not {args.new}")
+    if not rows:
+        print("no concurrency levels in common")
+        return 1
+
+    print(f"{'sessions':>8} {'metric':<15} {'base':>10} {'new':>10} {'change':>9}")
+    for concurrency, metric, before, after, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        change_str = "-" if change is None else f"{change:+.1f}%"
+        print(f"{concurrency:>8} {metric:<15} {_fmt(before, '.2f'):>10} {_fmt(after, '.2f'):>10} "
+              f"{change_str:>9}{flag}")
+
+    return 1 if missing or any(row[-1] for row in rows) else 0
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError("expected a positive integer")
+    return number
+
+
+def _concurrency_list(value):
+    levels = [int(part) for part in value.split(",") if part.strip()]
+    if not levels or any(level < 1 for level in levels):
+        raise argparse.ArgumentTypeError("expected positive integers, e.g. 1,2,4,8")
+    return levels
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for app.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the load test at increasing concurrency")
+    run.add_argument("--concurrency", type=_concurrency_list, default=[1, 2, 4, 8],
+                     help="comma-separated session counts (default: 1,2,4,8)")
+    run.add_argument("--reruns", type=_positive_int, default=20,
+                     help="filter changes per session (default: 20)")
+    run.add_argument("--backend", choices=["auto", *BACKENDS], default="auto")
+    run.add_argument("--think-ms", type=float, default=0,
+                     help="pause between a session's reruns (default: 0)")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--timeout", type=float, default=30,
+                     help="seconds allowed per rerun (default: 30)")
+    run.add_argument("--no-isolate", action="store_true",
+                     help="run standin levels in this process instead of a fresh worker each")
+    run.add_argument("--label", help="free-form name stored with the results")
+    run.add_argument("--output", help="write results as JSON for later comparison")
+    run.add_argument("--slo-p95-ms", type=float)
+    run.add_argument("--slo-p99-ms", type=float)
+    run.add_argument("--slo-rss-mb", type=float, help="peak RSS limit per process")
+    run.add_argument("--max-error-rate", type=float, default=0.0,
+                     help="fraction of failed reruns tolerated (default: 0)")
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="compare two saved runs")
+    compare.add_argument("base")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=10,
+                         help="percent change counted as a regression (default: 10)")
+    compare.set_defaults(func=cmd_compare)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # app.py reads its CSVs relative to the working directory
+    os.chdir(APP_DIR)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+import argparse
+import datetime as dt
+import random
+
+import pytest
+
+import loadtest
+
+
+def make_level(concurrency=1, processes=1, **overrides):
+    level = {
+        "concurrency": concurrency,
+        "processes": processes,
+        "reruns": 10,
+        "errors": 0,
+        "p50_ms": 100.0,
+        "p95_ms": 200.0,
+        "p99_ms": 300.0,
+        "throughput_rps": 5.0,
+        "rss_peak_mb": 150.0,
+        "rss_total_peak_mb": 150.0 * processes,
+    }
+    level.update(overrides)
+    return level
+
+
+def slo_args(p95=None, p99=None, rss=None, max_error_rate=0.0):
+    return argparse.Namespace(slo_p95_ms=p95, slo_p99_ms=p99, slo_rss_mb=rss,
+                              max_error_rate=max_error_rate)
+
+
+# percentile
+
+def test_percentile_interpolates_between_ranks():
+    values = [10, 20, 30, 40]
+    assert loadtest.percentile(values, 0) == 10
+    assert loadtest.percentile(values, 50) == 25
+    assert loadtest.percentile(values, 100) == 40
+    assert loadtest.percentile(values, 95) == pytest.approx(38.5)
+
+
+def test_percentile_single_and_empty():
+    assert loadtest.percentile([7.0], 99) == 7.0
+    assert loadtest.percentile([], 50) is None
+
+
+# compare_reports
+
+def test_compare_flags_latency_increase_and_throughput_drop():
+    base = {"levels": [make_level()]}
+    new = {"levels": [make_level(p95_ms=250.0, throughput_rps=4.0)]}
+    rows, missing = loadtest.compare_reports(base, new, threshold=10)
+
+    regressed = {metric for _, metric, _, _, _, flag in rows if flag}
+    assert regressed == {"p95_ms", "throughput_rps"}
+    assert missing == []
+
+
+def test_compare_improvement_is_not_a_regression():
+    base = {"levels": [make_level()]}
+    new = {"levels": [make_level(p50_ms=50.0, throughput_rps=10.0)]}
+    rows, _ = loadtest.compare_reports(base, new, threshold=10)
+    assert not any(flag for *_, flag in rows)
+
+
+def find_row(rows, metric):
+    return next(row for row in rows if row[1] == metric)
+
+
+def test_compare_zero_baseline_has_no_percentage():
+    base = {"levels": [make_level(p50_ms=0.0, throughput_rps=0.0)]}
+    new = {"levels": [make_level(p50_ms=5.0, throughput_rps=5.0)]}
+    rows, _ = loadtest.compare_reports(base, new, threshold=10)
+    assert find_row(rows, "p50_ms")[4:] == (None, False)
+    assert find_row(rows, "throughput_rps")[4:] == (None, False)
+
+
+def test_compare_flags_any_error_rate_increase():
+    base = {"levels": [make_level(reruns=100, errors=0)]}
+    new = {"levels": [make_level(reruns=99, errors=1)]}
+    rows, _ = loadtest.compare_reports(base, new, threshold=10)
+    assert find_row(rows, "error_pct")[2:] == (0.0, 1.0, None, True)
+
+    rows, _ = loadtest.compare_reports(new, base, threshold=10)
+    assert find_row(rows, "error_pct")[5] is False
+
+
+def test_compare_missing_metric_value():
+    base = {"levels": [make_level(p99_ms=None)]}
+    new = {"levels": [make_level()]}
+    rows, _ = loadtest.compare_reports(base, new, threshold=10)
+    assert find_row(rows, "p99_ms")[2:] == (None, 300.0, None, False)
+
+
+def test_compare_reports_levels_missing_from_new_run():
+    base = {"levels": [make_level(1), make_level(4)]}
+    new = {"levels": [make_level(1)]}
+    rows, missing = loadtest.compare_reports(base, new, threshold=10)
+    assert missing == [4]
+    assert {row[0] for row in rows} == {1}
+
+
+def test_compare_total_rss_only_for_multi_process_runs():
+    single = {"levels": [make_level()]}
+    rows, _ = loadtest.compare_reports(single, single, threshold=10)
+    assert "rss_total_peak_mb" not in {row[1] for row in rows}
+
+    multi = {"levels": [make_level(4, processes=4)]}
+    rows, _ = loadtest.compare_reports(multi, multi, threshold=10)
+    assert "rss_total_peak_mb" in {row[1] for row in rows}
+
+
+# summarize / add_rss_per_session
+
+def test_summarize_aggregates_user_results():
+    results = [
+        {"latencies_ms": [30.0, 10.0], "startup_ms": 500.0, "errors": 0, "messages": []},
+        {"latencies_ms": [20.0], "startup_ms": 700.0, "errors": 1, "messages": ["page: boom"]},
+    ]
+    mb = 1024 * 1024
+    level = loadtest.summarize({"concurrency": 2}, results, wall_s=2.0, rss_baseline=100 * mb,
+                               rss_peaks=[160 * mb], processes=1)
+
+    assert level["reruns"] == 3
+    assert level["errors"] == 1
+    assert level["error_samples"] == ["page: boom"]
+    assert level["throughput_rps"] == 1.5
+    assert level["p50_ms"] == 20.0
+    assert level["max_ms"] == 30.0
+    assert level["startup_max_ms"] == 700.0
+    assert level["rss_baseline_mb"] == 100.0
+    assert level["rss_peak_mb"] == level["rss_total_peak_mb"] == 160.0
+    # Per-session memory needs the other levels; see add_rss_per_session
+    assert "rss_per_session_mb" not in level
+
+
+def test_summarize_with_no_successful_reruns():
+    results = [{"latencies_ms": [], "startup_ms": None, "errors": 1, "messages": ["startup"]}]
+    level = loadtest.summarize({"concurrency": 1}, results, wall_s=0.5, rss_baseline=None,
+                               rss_peaks=[None], processes=1)
+    assert level["reruns"] == 0
+    assert level["p99_ms"] is None
+    assert level["rss_peak_mb"] is None
+
+
+def test_rss_per_session_is_marginal_over_one_session():
+    levels = [make_level(1, rss_peak_mb=200.0), make_level(4, rss_peak_mb=230.0),
+              make_level(8, rss_peak_mb=270.0)]
+    loadtest.add_rss_per_session(levels)
+    assert [level["rss_per_session_mb"] for level in levels] == [None, 10.0, 10.0]
+
+
+def test_rss_per_session_needs_a_single_process_one_session_level():
+    levels = [make_level(2, rss_peak_mb=200.0), make_level(4, rss_peak_mb=230.0)]
+    loadtest.add_rss_per_session(levels)
+    assert all(level["rss_per_session_mb"] is None for level in levels)
+
+    levels = [make_level(1), make_level(4, processes=4)]
+    loadtest.add_rss_per_session(levels)
+    assert levels[1]["rss_per_session_mb"] is None
+
+
+# check_slos
+
+def test_slos_pass_at_the_limit():
+    assert loadtest.check_slos(make_level(), slo_args(p95=200, p99=300, rss=150)) == []
+
+
+def test_slos_report_each_breach():
+    breaches = loadtest.check_slos(make_level(), slo_args(p95=199, p99=299, rss=149))
+    assert len(breaches) == 3
+
+
+def test_slos_ignore_missing_values():
+    level = make_level(p95_ms=None, rss_peak_mb=None)
+    assert loadtest.check_slos(level, slo_args(p95=1, rss=1)) == []
+
+
+def test_error_rate_with_no_attempts_is_not_a_breach():
+    level = make_level(reruns=0, errors=0)
+    assert loadtest.check_slos(level, slo_args()) == []
+
+
+def test_error_rate_over_limit():
+    level = make_level(reruns=9, errors=1)
+    assert loadtest.check_slos(level, slo_args(max_error_rate=0.2)) == []
+    assert len(loadtest.check_slos(level, slo_args(max_error_rate=0.05))) == 1
+
+
+# random_change
+
+BOUNDS = {
+    "min_date": dt.date(2025, 5, 16),
+    "max_date": dt.date(2025, 9, 12),
+    "platforms": ["Facebook", "Google", "TikTok"],
+}
+
+
+def test_random_change_stays_within_bounds():
+    rng = random.Random(0)
+    state = loadtest.initial_state(BOUNDS)
+    seen = set()
+    for _ in range(300):
+        seen.add(loadtest.random_change(rng, state, BOUNDS))
+        start, end = state["date_range"]
+        assert BOUNDS["min_date"] <= start <= end <= BOUNDS["max_date"]
+        assert state["page"] in loadtest.PAGES
+        assert state["platforms"] == ["All"] or (
+            state["platforms"] and set(state["platforms"]) <= set(BOUNDS["platforms"]))
+    assert seen == {"page", "date_range", "platforms"}
+
+
+def test_random_change_is_reproducible_from_seed():
+    def sequence(seed):
+        rng = random.Random(seed)
+        state = loadtest.initial_state(BOUNDS)
+        return [(loadtest.random_change(rng, state, BOUNDS), dict(state)) for _ in range(20)]
+
+    assert sequence(1) == sequence(1)
+
+
+# command line
+
+@pytest.mark.parametrize("value", ["0", "-3"])
+def test_reruns_must_be_positive(value):
+    with pytest.raises(SystemExit):
+        loadtest.build_parser().parse_args(["run", "--reruns", value])
+
+
+def test_auto_backend_is_standin():
+    assert loadtest.resolve_backend("auto") == "standin"
+    assert loadtest.resolve_backend("apptest") == "apptest"
+
+
+# stand-in backend
+
+STUB_APP = """
+import streamlit as st
+
+serialized = []
+
+
+class Serializable:
+    def __init__(self, name):
+        self.name = name
+
+    def to_json(self):
+        serialized.append(self.name)
+        return "{}"
+
+
+@st.cache_data
+def load_data():
+    return {"rows": [1, 2, 3]}
+
+
+data = load_data()
+data["rows"].append(99)
+
+st.set_page_config(page_title="stub", layout="wide")
+page = st.sidebar.selectbox("Navigate to:", ["a", "b"])
+date_range = st.sidebar.date_input("Select Date Range:", value=None)
+selected_platforms = st.sidebar.multiselect("Select Platforms:", ["All"], default=["All"])
+st.sidebar.markdown("---")
+
+col1, col2 = st.columns(2)
+with col1:
+    st.metric("Spend", "$1")
+col2.write("text")
+for tab in st.tabs(["x", "y"]):
+    with tab:
+        st.plotly_chart(Serializable("chart"), use_container_width=True)
+st.dataframe(Serializable("table"), use_container_width=True)
+
+if page == FAILING_PAGE:
+    raise ValueError("page failed")
+"""
+
+
+@pytest.fixture
+def stub_app(tmp_path):
+    def write(failing_page=None):
+        path = tmp_path / "stub_app.py"
+        path.write_text(f"FAILING_PAGE = {failing_page!r}\n" + STUB_APP, encoding="utf-8")
+        return path
+    return write
+
+
+def threaded_config(script, **overrides):
+    config = {"backend": "standin", "script": str(script), "concurrency": 2, "reruns": 5,
+              "think_ms": 0, "seed": 0, "timeout": 5, "isolate": False}
+    config.update(overrides)
+    return config
+
+
+def test_standin_session_feeds_widgets_and_serializes_output(stub_app):
+    session = loadtest.StandInSession(stub_app(), timeout=5)
+    state = loadtest.initial_state(BOUNDS)
+    state["platforms"] = ["Google"]
+
+    script_globals = session.run(state)
+
+    assert script_globals["page"] == state["page"]
+    assert script_globals["date_range"] == state["date_range"]
+    assert script_globals["selected_platforms"] == ["Google"]
+    assert script_globals["serialized"] == ["chart", "chart", "table"]
+
+
+def test_standin_cache_returns_a_fresh_copy_per_rerun(stub_app):
+    session = loadtest.StandInSession(stub_app(), timeout=5)
+    state = loadtest.initial_state(BOUNDS)
+
+    first = session.run(state)["data"]
+    second = session.run(state)["data"]
+
+    assert first is not second
+    assert second["rows"] == [1, 2, 3, 99]
+
+
+def test_run_threaded_level_with_standin(stub_app):
+    level = loadtest.run_threaded_level(threaded_config(stub_app()), BOUNDS)
+
+    assert level["processes"] == 1
+    assert level["reruns"] == 10
+    assert level["errors"] == 0
+    assert level["p50_ms"] is not None
+    assert level["startup_max_ms"] is not None
+
+
+def test_run_threaded_level_counts_failed_reruns(stub_app):
+    config = threaded_config(stub_app(failing_page=loadtest.PAGES[1]), reruns=30)
+    level = loadtest.run_threaded_level(config, BOUNDS)
+
+    assert level["errors"] > 0
+    assert level["reruns"] + level["errors"] == 60
+    assert "ValueError('page failed')" in level["error_samples"][0]